@@ -1,13 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import gradio as gr
 import pandas as pd
 
 from data_processor import (
     load_data,
     get_basic_info,
+    get_column_metadata,
     get_preview,
     get_summary_statistics,
     get_missing_report,
     get_correlation_matrix,
+    get_unique_values,
     filter_dataframe,
     save_dataframe_to_temp_csv,
 )
@@ -21,6 +25,16 @@ from insights import (
     get_top_n,
     get_simple_outliers,
 )
+from utils import is_nonempty
+
+# Profiles freshly uploaded datasets in the background (see handle_upload).
+_BG_POOL = ThreadPoolExecutor(max_workers=2)
+
+
+def _profile_dataset(df: pd.DataFrame):
+    """Run the Statistics tab computations; results also land in the per-frame cache."""
+    return get_summary_statistics(df), get_missing_report(df), get_correlation_matrix(df)
+
 
 def create_dashboard():
     """Create and configure the BI dashboard Gradio app.
@@ -33,7 +47,8 @@ def create_dashboard():
         gr.Markdown("# Business Intelligence Dashboard")
         gr.Markdown("Upload a dataset to begin exploring.")
 
-        df_state = gr.State(value=None)
+        # (DataFrame, column metadata) for the current dataset
+        df_state = gr.State(value=(None, None))
 
         # -------- Data Upload Tab --------
         with gr.Tab("Data Upload"):
@@ -58,20 +73,24 @@ def create_dashboard():
 
                 Returns:
                     Tuple of:
-                        - DataFrame or None
+                        - (DataFrame, column metadata) state tuple, or (None, None)
                         - dataset info dict
                         - preview DataFrame
                         - status message string
                 """
                 if file is None:
-                    return None, {}, pd.DataFrame(), "Please upload a file first."
+                    return (None, None), {}, pd.DataFrame(), "Please upload a file first."
                 try:
                     df = load_data(file)
+                    meta = get_column_metadata(df)
+                    if len(df):
+                        # start profiling now so the Statistics tab is ready when opened
+                        meta["stats"] = _BG_POOL.submit(_profile_dataset, df)
                     info = get_basic_info(df)
                     preview = get_preview(df, n_rows)
-                    return df, info, preview, "✅ Data loaded successfully."
+                    return (df, meta), info, preview, "✅ Data loaded successfully."
                 except Exception as e:
-                    return None, {}, pd.DataFrame(), f"⚠️ {str(e)}"
+                    return (None, None), {}, pd.DataFrame(), f"⚠️ {str(e)}"
 
             upload_button.click(
                 fn=handle_upload,
@@ -91,11 +110,11 @@ def create_dashboard():
             corr_matrix_df = gr.Dataframe(label="Correlation Matrix")
             stats_msg = gr.Markdown()
 
-            def compute_stats(df: pd.DataFrame | None):
+            def compute_stats(state: tuple):
                 """Compute statistics, missing report, and correlation matrix for the dataset.
                 
                 Args:
-                    df (pd.DataFrame | None): Current dataset from state.
+                    state (tuple): Current (DataFrame, metadata) pair from state.
 
                 Returns:
                     Tuple of:
@@ -105,7 +124,8 @@ def create_dashboard():
                         - correlation matrix DataFrame
                         - status message string
                 """
-                if df is None or len(df) == 0:
+                df, meta = state
+                if not is_nonempty(df):
                     return (
                         pd.DataFrame(),
                         pd.DataFrame(),
@@ -113,9 +133,13 @@ def create_dashboard():
                         pd.DataFrame(),
                         "⚠️ Please upload data first in the Data Upload tab.",
                     )
-                stats = get_summary_statistics(df)
-                missing = get_missing_report(df)
-                corr = get_correlation_matrix(df)
+                profile = meta.get("stats")
+                if profile is not None and profile.done() and profile.exception() is None:
+                    stats, missing, corr = profile.result()
+                else:
+                    # still running (or failed): these calls join the background computation
+                    # through the per-frame cache instead of starting a second one
+                    stats, missing, corr = _profile_dataset(df)
                 return (
                     stats["numeric"],
                     stats["categorical"],
@@ -175,7 +199,7 @@ def create_dashboard():
                 Returns:
                     str | None: Path to a temporary CSV file, or None if no data.
                 """
-                if df is None or len(df) == 0:
+                if not is_nonempty(df):
                     return None
                 filepath = save_dataframe_to_temp_csv(df)
                 return filepath
@@ -186,19 +210,19 @@ def create_dashboard():
                 outputs=[download_file],
             )
 
-            def load_columns(df: pd.DataFrame | None):
+            def load_columns(state: tuple):
                 """Load column names into the filter column dropdown.
                 
                 Args:
-                    df (pd.DataFrame | None): Current dataset.
+                    state (tuple): Current (DataFrame, metadata) pair.
 
                 Returns:
                     gr.update: Updated choices for the column dropdown.
                 """
-                if df is None or len(df) == 0:
+                df, meta = state
+                if not is_nonempty(df):
                     return gr.update(choices=[])
-                cols = list(df.columns.astype(str))
-                return gr.update(choices=cols)
+                return gr.update(choices=meta["cols"])
 
             refresh_cols_btn.click(
                 fn=load_columns,
@@ -206,28 +230,26 @@ def create_dashboard():
                 outputs=[column_dropdown],
             )
 
-            def update_categories(df: pd.DataFrame | None, col: str):
+            def update_categories(state: tuple, col: str):
                 """Update category choices based on the selected column.
                 For non-numeric columns, returns up to 100 unique values.
                 
                 Args:
-                    df (pd.DataFrame | None): Current dataset.
+                    state (tuple): Current (DataFrame, metadata) pair.
                     col (str): Selected column name.
 
                 Returns:
                     gr.update: Updated choices for the category multiselect.
                 """
-                if df is None or len(df) == 0 or col is None or col == "":
+                df, _ = state
+                if not is_nonempty(df) or col is None or col == "":
                     return gr.update(choices=[])
                 if col not in df.columns:
                     return gr.update(choices=[])
                 series = df[col]
                 if not pd.api.types.is_numeric_dtype(series):
-                    # for non-numeric columns, list unique values
-                    uniques = sorted(series.dropna().astype(str).unique().tolist())
-                    # cap length to avoid massive dropdowns
-                    uniques = uniques[:100]
-                    return gr.update(choices=uniques)
+                    # for non-numeric columns, list unique values (capped, cached per dataset)
+                    return gr.update(choices=get_unique_values(df, col, limit=100))
                 else:
                     return gr.update(choices=[])
 
@@ -238,7 +260,7 @@ def create_dashboard():
             )
 
             def apply_filter(
-                df: pd.DataFrame | None,
+                state: tuple,
                 col: str,
                 min_val,
                 max_val,
@@ -247,7 +269,7 @@ def create_dashboard():
                 """Apply the current filter settings to the DataFrame and return the filtered data and message.
                 
                 Args:
-                    df (pd.DataFrame | None): Current dataset.
+                    state (tuple): Current (DataFrame, metadata) pair.
                     col (str): Column to filter on.
                     min_val: Minimum value for numeric filter.
                     max_val: Maximum value for numeric filter.
@@ -256,7 +278,8 @@ def create_dashboard():
                 Returns:
                     Tuple[pd.DataFrame, str]: Filtered DataFrame and status message.
                 """
-                if df is None or len(df) == 0:
+                df, _ = state
+                if not is_nonempty(df):
                     return pd.DataFrame(), "⚠️ Please upload data first."
                 if not col:
                     return pd.DataFrame(), "⚠️ Please select a column."
@@ -317,25 +340,20 @@ def create_dashboard():
             vis_msg = gr.Markdown()
             vis_refresh = gr.Button("Refresh Columns")
 
-            def load_vis_columns(df: pd.DataFrame | None):
+            def load_vis_columns(state: tuple):
                 """Load column names into the visualization dropdowns based on data types.
                 
                 Args:
-                    df (pd.DataFrame | None): Current dataset.
+                    state (tuple): Current (DataFrame, metadata) pair.
 
                 Returns:
                     Tuple of gr.update objects for each visualization-related dropdown.
                 """
-                if df is None or len(df) == 0:
+                df, meta = state
+                if not is_nonempty(df):
                     empty = gr.update(choices=[])
                     return empty, empty, empty, empty, empty
-                cols = df.columns.astype(str).tolist()
-                num_cols = df.select_dtypes(include="number").columns.astype(str).tolist()
-                # crude date detection: columns containing 'date' or already datetime
-                date_like = [
-                    c for c in cols
-                    if "date" in c.lower() or pd.api.types.is_datetime64_any_dtype(df[c])
-                ]
+                cols, num_cols, date_like = meta["cols"], meta["num"], meta["date"]
                 return (
                     gr.update(choices=num_cols),  # vis_column
                     gr.update(choices=cols),      # cat_x
@@ -350,11 +368,11 @@ def create_dashboard():
                 outputs=[vis_column, cat_x, cat_y, ts_date, ts_value],
             )
 
-            def make_plot(df, vtype, col, kind, x_cat, y_val, agg, date_col, ts_val, ts_agg_sel):
+            def make_plot(state, vtype, col, kind, x_cat, y_val, agg, date_col, ts_val, ts_agg_sel):
                 """Dispatch to the appropriate visualization strategy based on the selected type.
                 
                 Args:
-                    df (pd.DataFrame | None): Current dataset.
+                    state (tuple): Current (DataFrame, metadata) pair.
                     vtype (str): Visualization type selected by the user.
                     col (str): Column for distribution plot.
                     kind (str): Distribution kind ('hist' or 'box').
@@ -368,7 +386,8 @@ def create_dashboard():
                 Returns:
                     Tuple[plot, str]: Plot object (image or figure) and status message.
                 """
-                if df is None or len(df) == 0:
+                df, _ = state
+                if not is_nonempty(df):
                     return None, "⚠️ Please upload data first."
 
                 if vtype == "Distribution":
@@ -426,20 +445,19 @@ def create_dashboard():
             ins_msg = gr.Markdown()
             ins_btn = gr.Button("Generate Insights")
 
-            def load_insight_columns(df: pd.DataFrame | None):
+            def load_insight_columns(state: tuple):
                 """Generate top-N and outlier insights from the given DataFrame.
                 
                 Args:
-                    df (pd.DataFrame | None): Current dataset.
+                    state (tuple): Current (DataFrame, metadata) pair.
 
                 Returns:
                     Tuple of gr.update objects for group and value column dropdowns.
                 """
-                if df is None or len(df) == 0:
+                df, meta = state
+                if not is_nonempty(df):
                     return gr.update(choices=[]), gr.update(choices=[])
-                cols = df.columns.astype(str).tolist()
-                num_cols = df.select_dtypes(include="number").columns.astype(str).tolist()
-                return gr.update(choices=cols), gr.update(choices=num_cols)
+                return gr.update(choices=meta["cols"]), gr.update(choices=meta["num"])
             ins_refresh = gr.Button("Refresh Columns")
             ins_refresh.click(
                 fn=load_insight_columns,
@@ -448,11 +466,11 @@ def create_dashboard():
             )    
             # On app load or data change, you can also reuse df_state to fill these.
             
-            def run_insights(df: pd.DataFrame | None, group_col, value_col, n):
+            def run_insights(state: tuple, group_col, value_col, n):
                 """Generate top-N and outlier insights from the given DataFrame.
                 
                 Args:
-                    df (pd.DataFrame | None): Current dataset.
+                    state (tuple): Current (DataFrame, metadata) pair.
                     group_col (str): Column to group by for top-N.
                     value_col (str): Numeric column used for aggregation and outliers.
                     n (int): Number of top groups to return.
@@ -463,7 +481,8 @@ def create_dashboard():
                         - Outliers DataFrame
                         - Status message
                 """
-                if df is None or len(df) == 0:
+                df, _ = state
+                if not is_nonempty(df):
                     return pd.DataFrame(), pd.DataFrame(), "⚠️ Please upload/filter data first."
                 top_df = get_top_n(df, group_col, value_col, n=int(n))
                 out_df = get_simple_outliers(df, value_col)
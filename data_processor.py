@@ -1,7 +1,154 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, Dict, Any
 import tempfile
 import os
+from numba import get_num_threads, njit, prange
+
+from utils import cached_by_frame, columns_as_str, is_nonempty
+
+try:
+    import cupy
+except ImportError:  # optional: GPU correlation for very large numeric blocks
+    cupy = None
+
+
+# Worker threads for per-column statistics; NumPy reductions release the GIL.
+_STATS_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+_DESCRIBE_FIELDS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+# Below this many cells the PCIe transfer costs more than the CPU gemm.
+_GPU_CORR_MIN_SIZE = 100_000_000
+# Tall-skinny blocks are memory-bound, so they use the fused one-pass kernel.
+_FUSED_CORR_MIN_ROWS = 100_000
+_FUSED_CORR_MAX_COLS = 32
+
+
+def _prefetch_file(path: str) -> None:
+    """
+    Ask the kernel to start reading a file into the page cache in the background.
+
+    The readahead overlaps disk reads with CSV parsing on cold uploads.
+    Does nothing on platforms without posix_fadvise.
+
+    Args:
+        path (str): Path to the file.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+
+def _dedupe_column_names(names: list[str]) -> list[str]:
+    """
+    Rename repeated column names the way pd.read_csv does ("c", "c.1", "c.2", ...).
+
+    Args:
+        names (list[str]): Column names in file order.
+
+    Returns:
+        list[str]: Unique column names.
+    """
+    header = set(names)
+    counts: Dict[str, int] = {}
+    unique = []
+    for name in names:
+        base = name
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[base] = count + 1
+            name = f"{base}.{count}"
+            if name in header:
+                # the suffixed name belongs to another column in the file
+                count += 1
+            else:
+                count = counts.get(name, 0)
+        counts[name] = count + 1
+        unique.append(name)
+    return unique
+
+
+def _read_csv_arrow(path: str) -> pd.DataFrame:
+    """
+    Parse a CSV file with PyArrow's multithreaded reader.
+
+    Args:
+        path (str): Path to the CSV file.
+
+    Returns:
+        pd.DataFrame: Parsed dataset.
+
+    Raises:
+        ValueError: If a column contains text that is not valid UTF-8.
+    """
+    _prefetch_file(path)
+    read_options = pacsv.ReadOptions(use_threads=True, block_size=8 << 20)
+    # blank and NA/null cells in text columns are missing values, as in pd.read_csv
+    convert_options = pacsv.ConvertOptions(strings_can_be_null=True)
+    with pa.memory_map(path, "r") as source:
+        table = pacsv.read_csv(source, read_options=read_options, convert_options=convert_options)
+    # Arrow loads text that isn't valid UTF-8 as raw bytes; reject it like
+    # pd.read_csv did rather than passing bytes objects on to the UI
+    binary_cols = [field.name for field in table.schema if pa.types.is_binary(field.type)]
+    if binary_cols:
+        raise ValueError(f"Text is not valid UTF-8 in column(s): {', '.join(binary_cols)}")
+    # Arrow converts timestamps with a UTC offset to UTC and drops the offset,
+    # which moves their wall-clock dates. Keep such columns as text, as
+    # pd.read_csv did, so to_datetime later sees the original offsets.
+    offset_cols = {
+        field.name: pa.string()
+        for field in table.schema
+        if pa.types.is_timestamp(field.type) and field.type.tz is not None
+    }
+    if offset_cols:
+        with pa.memory_map(path, "r") as source:
+            table = pacsv.read_csv(
+                source,
+                read_options=read_options,
+                convert_options=pacsv.ConvertOptions(
+                    column_types=offset_cols, strings_can_be_null=True
+                ),
+            )
+    # Arrow keeps repeated header names as-is; with duplicates, df[col] would
+    # return a DataFrame instead of a Series
+    table = table.rename_columns(_dedupe_column_names(table.column_names))
+    # Arrow parses ISO dates; keep them as datetime64 rather than Python date objects.
+    return table.to_pandas(split_blocks=True, self_destruct=True, date_as_object=False)
+
+
+def _downcast(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink column dtypes after loading.
+
+    Integers are narrowed to the smallest type that holds them, floats are
+    narrowed to float32 only when that is lossless, and string columns whose
+    distinct values make up less than half of the rows become categoricals.
+
+    Args:
+        df (pd.DataFrame): Freshly loaded DataFrame.
+
+    Returns:
+        pd.DataFrame: DataFrame with narrowed dtypes.
+    """
+    for col in df.select_dtypes(include="integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    for col in df.select_dtypes(include="float").columns:
+        values = df[col].to_numpy()
+        narrowed = values.astype(np.float32)
+        # skip columns like 0.1 that float32 cannot represent exactly
+        if np.array_equal(narrowed, values, equal_nan=True):
+            df[col] = narrowed
+    if len(df):
+        for col in df.select_dtypes(include=["object", "string"]).columns:
+            if df[col].nunique() / len(df) < 0.5:
+                df[col] = df[col].astype("category")
+    return df
 
 
 def load_data(file) -> pd.DataFrame:
@@ -22,12 +169,12 @@ def load_data(file) -> pd.DataFrame:
     try:
         name = file.name
         if name.endswith(".csv"):
-            df = pd.read_csv(file.name)
+            df = _read_csv_arrow(file.name)
         elif name.endswith((".xlsx", ".xls")):
-            df = pd.read_excel(file.name)
+            df = pd.read_excel(file.name, engine="calamine")
         else:
             raise ValueError("Unsupported file format. Please upload CSV or Excel.")
-        return df
+        return _downcast(df)
     except Exception as e:
         raise ValueError(f"Error loading file: {str(e)}")
 
@@ -45,12 +192,37 @@ def get_basic_info(df: pd.DataFrame) -> Dict[str, Any]:
     info = {
         "rows": int(df.shape[0]),
         "columns": int(df.shape[1]),
-        "column_names": list(df.columns.astype(str)),
-        "dtypes": df.dtypes.astype(str).to_dict(),
+        "column_names": columns_as_str(df.columns),
+        "dtypes": {c: str(t) for c, t in zip(df.columns, df.dtypes)},
     }
     return info
 
 
+def get_column_metadata(df: pd.DataFrame) -> Dict[str, list[str]]:
+    """
+    Return the column lists used to populate the dashboard dropdowns.
+
+    Computed once per upload so the dropdown refresh callbacks don't have to
+    inspect the DataFrame again.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame.
+
+    Returns:
+        Dict[str, list[str]]: All columns ("cols"), numeric columns ("num") and
+        date-like columns ("date"), as strings.
+    """
+    cols = columns_as_str(df.columns)
+    num_cols = columns_as_str(df.select_dtypes(include="number").columns)
+    # crude date detection: columns containing 'date' or already datetime (kind "M"),
+    # read from the dtypes in one pass instead of looking each column up
+    date_like = [
+        c for c, dtype in zip(cols, df.dtypes)
+        if dtype.kind == "M" or "date" in c.lower()
+    ]
+    return {"cols": cols, "num": num_cols, "date": date_like}
+
+
 def get_preview(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
     """
     Return first n rows as a preview.
@@ -58,6 +230,34 @@ def get_preview(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
     return df.head(n)
 
 
+def _describe_column(series: pd.Series) -> list[float]:
+    """Compute describe()-style statistics for one numeric column with NumPy."""
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    values = values[~np.isnan(values)]  # always a private copy, safe to reorder
+    count = len(values)
+    if count == 0:
+        return [0.0] + [np.nan] * 7
+    mean = values.mean()
+    std = values.std(ddof=1) if count > 1 else np.nan
+    # min, quartiles and max from one in-place partitioning pass
+    lo, q1, q2, q3, hi = np.percentile(values, [0, 25, 50, 75, 100], overwrite_input=True)
+    return [float(count), mean, std, lo, q1, q2, q3, hi]
+
+
+def _describe_numeric_parallel(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Equivalent of df.select_dtypes(include="number").describe().T, with the
+    per-column work spread over a thread pool.
+    """
+    numeric_df = df.select_dtypes(include="number")
+    if numeric_df.shape[1] == 0:
+        return pd.DataFrame()
+    columns = [numeric_df.iloc[:, i] for i in range(numeric_df.shape[1])]
+    rows = list(_STATS_POOL.map(_describe_column, columns))
+    return pd.DataFrame.from_records(rows, index=numeric_df.columns, columns=_DESCRIBE_FIELDS)
+
+
+@cached_by_frame
 def get_summary_statistics(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
     """
     Return summary stats for numeric and categorical columns.
@@ -69,14 +269,20 @@ def get_summary_statistics(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
     Returns:
         Dict[str, pd.DataFrame]: Summary statistics for numeric and categorical columns.
     """
-    numeric_desc = df.select_dtypes(include="number").describe().T
-    categorical_desc = df.select_dtypes(exclude="number").describe().T
+    numeric_desc = _describe_numeric_parallel(df)
+    categorical_df = df.select_dtypes(exclude="number")
+    if categorical_df.shape[1] == 0:
+        categorical_desc = pd.DataFrame()
+    else:
+        # include="all" so string columns are still described next to datetime ones
+        categorical_desc = categorical_df.describe(include="all").T
     return {
         "numeric": numeric_desc,
         "categorical": categorical_desc,
     }
 
 
+@cached_by_frame
 def get_missing_report(df: pd.DataFrame) -> pd.DataFrame:
     """
     Return missing values per column.
@@ -87,7 +293,20 @@ def get_missing_report(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame with missing value counts and percentages.
     """
-    missing = df.isna().sum()
+    counts = np.zeros(df.shape[1], dtype=np.int64)
+    # pick the Arrow-backed columns from the dtypes alone; building a Series per
+    # column just to inspect its array costs more than scanning NumPy columns
+    arrow = [
+        isinstance(t, pd.ArrowDtype) or (isinstance(t, pd.StringDtype) and t.storage == "pyarrow")
+        for t in df.dtypes
+    ]
+    to_scan = [i for i, is_arrow in enumerate(arrow) if not is_arrow]
+    for i in np.flatnonzero(arrow):
+        # Arrow keeps a null count per chunk, so no need to scan the values
+        counts[i] = df.iloc[:, i].array.__arrow_array__().null_count
+    if to_scan:
+        counts[to_scan] = df.iloc[:, to_scan].isna().sum().to_numpy()
+    missing = pd.Series(counts, index=df.columns)
     percent = (missing / len(df)) * 100
     report = pd.DataFrame(
         {
@@ -98,20 +317,147 @@ def get_missing_report(df: pd.DataFrame) -> pd.DataFrame:
     return report
 
 
-def get_correlation_matrix(df: pd.DataFrame) -> pd.DataFrame:
+@njit(cache=True, parallel=True)
+def _fused_cross_products(arr, nchunks):
+    """Column sums and the upper triangle of X^T X in a single pass over arr.
+
+    Values are shifted by the first row before accumulating (correlation is
+    shift-invariant) so the float64 sums don't cancel catastrophically. Each
+    chunk of rows has private accumulators, reduced at the end.
+    """
+    n, k = arr.shape
+    step = (n + nchunks - 1) // nchunks
+    sums = np.zeros((nchunks, k))
+    prods = np.zeros((nchunks, k, k))
+    for c in prange(nchunks):
+        row = np.empty(k)
+        for i in range(c * step, min(n, (c + 1) * step)):
+            for a in range(k):
+                row[a] = arr[i, a] - arr[0, a]
+                sums[c, a] += row[a]
+            for a in range(k):
+                for b in range(a, k):
+                    prods[c, a, b] += row[a] * row[b]
+    return sums.sum(axis=0), prods.sum(axis=0)
+
+
+def _fused_corrcoef(block: np.ndarray) -> np.ndarray:
+    """
+    Correlate the columns of a tall, narrow block with one pass over memory.
+
+    Args:
+        block (np.ndarray): 2D array without missing values, one column per variable.
+
+    Returns:
+        np.ndarray: Correlation matrix (NaN for constant columns).
+    """
+    n = block.shape[0]
+    sums, prods = _fused_cross_products(block, min(get_num_threads(), n))
+    prods = np.triu(prods) + np.triu(prods, 1).T
+    cov = (prods - np.outer(sums, sums) / n) / (n - 1)
+    std = np.sqrt(np.diag(cov))
+    return np.clip(cov / np.outer(std, std), -1.0, 1.0)
+
+
+def _gpu_corrcoef(block: np.ndarray) -> np.ndarray | None:
+    """
+    Correlate the columns of a float32 block on the GPU with CuPy.
+
+    Args:
+        block (np.ndarray): 2D array without missing values, one column per variable.
+
+    Returns:
+        np.ndarray | None: Correlation matrix, or None if no usable GPU is present.
+    """
+    try:
+        return cupy.asnumpy(cupy.corrcoef(cupy.asarray(block), rowvar=False))
+    except Exception:
+        # cupy imports fine on machines without a CUDA device; fall back to the CPU
+        return None
+
+
+@cached_by_frame
+def get_correlation_matrix(df: pd.DataFrame, dtype: type = np.float64) -> pd.DataFrame:
     """
     Return correlation matrix for numeric columns.
 
     Args:
         df (pd.DataFrame): Input DataFrame.
+        dtype (type): Float type the numeric columns are read into for the
+            complete-column paths. np.float32 halves the memory and runs sgemm,
+            which is plenty for display at two decimals. Columns with missing values
+            always go through DataFrame.corr in float64.
 
     Returns:
         pd.DataFrame: Correlation matrix.
     """
-    numeric_df = df.select_dtypes(include="number")
-    if numeric_df.shape[1] == 0:
+    # one pass over the dtypes instead of building a numeric sub-frame with select_dtypes
+    num_pos = np.array([i for i, t in enumerate(df.dtypes) if t.kind in "iuf"], dtype=np.int64)
+    if not len(num_pos):
         return pd.DataFrame()
-    return numeric_df.corr()
+    num_cols = df.columns[num_pos]
+    arr = np.empty((len(df), len(num_pos)), dtype=dtype)
+    for j, i in enumerate(num_pos):
+        arr[:, j] = df.iloc[:, i].to_numpy(dtype=dtype, na_value=np.nan)
+    nan_mask = np.isnan(arr)
+    has_nan = nan_mask.any(axis=0)
+    # all-NaN columns correlate as NaN with everything; leave them at the fill value
+    all_nan = nan_mask.all(axis=0)
+    del nan_mask
+    corr = np.full((arr.shape[1], arr.shape[1]), np.nan)
+    complete = np.flatnonzero(~has_nan)
+    present = np.flatnonzero(~all_nan)
+    if (has_nan & ~all_nan).any():
+        # pairwise-complete correlations need a NaN mask per pair; a single Cython
+        # nancorr call over the columns that have data covers every pair at once
+        corr[np.ix_(present, present)] = df.iloc[:, num_pos[present]].corr().to_numpy()
+        return pd.DataFrame(corr, index=num_cols, columns=num_cols)
+    # constant columns have zero variance and correlate as NaN, like DataFrame.corr
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gpu_block = None
+        if len(complete) and cupy is not None and arr.shape[0] * len(complete) >= _GPU_CORR_MIN_SIZE:
+            # float32 halves the PCIe transfer
+            gpu_block = _gpu_corrcoef(arr[:, complete].astype(np.float32, copy=False))
+        if gpu_block is not None:
+            corr[np.ix_(complete, complete)] = gpu_block
+        elif arr.shape[0] > _FUSED_CORR_MIN_ROWS and 0 < len(complete) < _FUSED_CORR_MAX_COLS:
+            corr[np.ix_(complete, complete)] = _fused_corrcoef(arr[:, complete])
+        elif len(complete):
+            # standardize the complete columns in place (fancy indexing already
+            # copied them into a fresh C-contiguous block), then one BLAS gemm
+            block = arr[:, complete]
+            block -= block.mean(axis=0)
+            # column norms via einsum: std() would allocate another N x k temporary
+            block /= np.sqrt(np.einsum("ij,ij->j", block, block) / (block.shape[0] - 1))
+            corr[np.ix_(complete, complete)] = np.clip(
+                (block.T @ block) / (block.shape[0] - 1), -1.0, 1.0
+            )
+    return pd.DataFrame(corr, index=num_cols, columns=num_cols)
+
+@cached_by_frame
+def get_unique_values(df: pd.DataFrame, column: str, limit: int = 100) -> list[str]:
+    """
+    Return up to `limit` distinct non-missing values of a column as sorted strings.
+
+    Only the first `limit` distinct values are stringified. For categorical
+    columns the categories are read directly without scanning the data.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame.
+        column (str): Column to inspect.
+        limit (int): Maximum number of values to return.
+
+    Returns:
+        list[str]: Sorted distinct values.
+    """
+    series = df[column]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.cat.categories[:limit]
+    else:
+        values = series.dropna().unique()[:limit]
+    # Index.astype(str) formats like Series.astype(str), which filter_dataframe matches on
+    return sorted(pd.Index(values).astype(str))
+
 
 def filter_dataframe(
     df: pd.DataFrame,
@@ -135,27 +481,45 @@ def filter_dataframe(
     Returns:
         pd.DataFrame: Filtered DataFrame.
     """
-    if df is None or len(df) == 0:
+    if not is_nonempty(df):
         return df
 
     if column not in df.columns:
         return df
 
     series = df[column]
+    # all active criteria are combined into one mask so the frame is indexed once
+    mask = None
 
     if pd.api.types.is_numeric_dtype(series):
-        if min_val is not None:
-            df = df[series >= min_val]
-        if max_val is not None:
-            df = df[series <= max_val]
+        if min_val is not None or max_val is not None:
+            if isinstance(series.dtype, np.dtype):
+                arr = series.to_numpy()
+            else:
+                arr = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            mask = np.ones(len(series), dtype=bool)
+            if min_val is not None:
+                mask &= arr >= min_val
+            if max_val is not None:
+                mask &= arr <= max_val
     else:
         if categories:
-            df = df[series.isin(categories)]
+            # category choices are offered as strings (see update_categories)
+            if pd.api.types.is_datetime64_any_dtype(series):
+                series = series.astype(str)
+            mask = series.isin(categories).to_numpy()
 
-    return df
+    if mask is None:
+        return df
+    return df.iloc[mask]
 
 def save_dataframe_to_temp_csv(df: pd.DataFrame) -> str | None:
     """Save df to a temp CSV file and return its filepath.
+
+    The file is written by Arrow's CSV writer, whose formatting differs from
+    DataFrame.to_csv: booleans are written as true/false and datetimes with
+    their time part (2020-01-01 00:00:00.000000), and the header and every
+    string value are quoted. Frames Arrow can't convert are written with to_csv.
     
     Args:
         df (pd.DataFrame): DataFrame to save.
@@ -163,9 +527,19 @@ def save_dataframe_to_temp_csv(df: pd.DataFrame) -> str | None:
     Returns:
         str | None: Filepath of the saved CSV, or None if df is empty.
     """
-    if df is None or df.empty:
+    if not is_nonempty(df):
         return None
     fd, path = tempfile.mkstemp(suffix=".csv", prefix="filtered_")
     os.close(fd)
-    df.to_csv(path, index=False)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pacsv.write_csv(
+            table,
+            path,
+            write_options=pacsv.WriteOptions(batch_size=65536),
+        )
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # mixed-type object columns have no Arrow equivalent, and the writer
+        # doesn't support every type (e.g. nested columns)
+        df.to_csv(path, index=False)
     return path
\ No newline at end of file
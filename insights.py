@@ -1,4 +1,98 @@
+import numpy as np
 import pandas as pd
+from numba import get_num_threads, njit, prange
+
+from utils import is_nonempty
+
+# Aggregations handled by the compiled group kernel; anything else goes through pandas.
+_KERNEL_AGGS = ("sum", "mean", "count")
+
+
+@njit(cache=True, parallel=True)
+def _group_sums_counts(codes, values, ngroups, nchunks):
+    """Per-group sum and non-NaN count of values; negative codes (missing keys) are skipped.
+
+    Rows are split into chunks with private accumulators so threads never write
+    to the same slot, then the chunk results are reduced.
+    """
+    n = codes.shape[0]
+    step = (n + nchunks - 1) // nchunks
+    sums = np.zeros((nchunks, ngroups))
+    counts = np.zeros((nchunks, ngroups), dtype=np.int64)
+    for c in prange(nchunks):
+        for i in range(c * step, min(n, (c + 1) * step)):
+            g = codes[i]
+            v = values[i]
+            if g >= 0 and not np.isnan(v):
+                sums[c, g] += v
+                counts[c, g] += 1
+    return sums.sum(axis=0), counts.sum(axis=0)
+
+
+@njit(cache=True, parallel=True)
+def _zscore_outlier_mask(values, z_thresh):
+    """Flag values whose population z-score exceeds z_thresh in magnitude; NaNs are never flagged.
+
+    Mean and standard deviation skip NaNs, like pandas. A constant or empty
+    column flags nothing.
+    """
+    n = values.shape[0]
+    total = 0.0
+    count = 0
+    for i in prange(n):
+        if not np.isnan(values[i]):
+            total += values[i]
+            count += 1
+    mask = np.zeros(n, dtype=np.bool_)
+    if count == 0:
+        return mask
+    mean = total / count
+    sq = 0.0
+    for i in prange(n):
+        if not np.isnan(values[i]):
+            sq += (values[i] - mean) ** 2
+    limit = z_thresh * np.sqrt(sq / count)
+    if limit == 0:
+        return mask
+    for i in prange(n):
+        # |x - mean| > z * std is the same test as |z| > z_thresh
+        mask[i] = abs(values[i] - mean) > limit
+    return mask
+
+
+def _top_n_positions(values: np.ndarray, n: int) -> np.ndarray:
+    """Positions of the n largest values, largest first (NaN last).
+
+    Only n values are needed, so partition in O(len) and sort just those n.
+    """
+    if 0 < n < len(values):
+        idx = np.argpartition(-values, n)[:n]
+        return idx[np.argsort(-values[idx], kind="stable")]
+    return np.argsort(-values, kind="stable")[:n]
+
+
+def _top_n_grouped_kernel(df: pd.DataFrame, group_col: str, value_col: str, n: int, agg: str):
+    """Compute get_top_n for sum/mean/count with the compiled group kernel."""
+    values = df[value_col]
+    codes, uniques = pd.factorize(df[group_col], sort=False)
+    # one accumulator row per thread, but only when rows outnumber groups enough to pay off
+    nchunks = max(1, min(get_num_threads(), len(df) // max(4 * len(uniques), 1)))
+    sums, counts = _group_sums_counts(
+        codes.astype(np.int64, copy=False),
+        values.to_numpy(dtype=np.float64, na_value=np.nan),
+        len(uniques),
+        nchunks,
+    )
+    if agg == "count":
+        agg_vals = counts
+    elif agg == "mean":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            agg_vals = sums / counts
+    else:
+        agg_vals = sums
+
+    return pd.DataFrame({group_col: uniques, value_col: agg_vals}).iloc[_top_n_positions(agg_vals, n)]
+
 
 def get_top_n(df: pd.DataFrame, group_col: str, value_col: str, n: int = 5, agg: str = "sum"):
     """Return the top N groups by an aggregated numeric column.
@@ -13,12 +107,26 @@ def get_top_n(df: pd.DataFrame, group_col: str, value_col: str, n: int = 5, agg:
     Returns:
         pd.DataFrame: DataFrame with top N groups and their aggregated values.
     """
-    if df is None or df.empty:
+    if not is_nonempty(df):
         return pd.DataFrame()
     if group_col not in df.columns or value_col not in df.columns:
         return pd.DataFrame()
-    grouped = df.groupby(group_col)[value_col].agg(agg).reset_index()
-    return grouped.sort_values(by=value_col, ascending=False).head(n)
+    if (
+        agg in _KERNEL_AGGS
+        and group_col != value_col
+        and pd.api.types.is_numeric_dtype(df[value_col])
+        # the kernel accumulates in float64, which is inexact for integer sums
+        # past 2**53; pandas sums integers exactly in int64
+        and not (agg == "sum" and df[value_col].dtype.kind in "iub")
+    ):
+        return _top_n_grouped_kernel(df, group_col, value_col, n, agg)
+    # ranking happens below, so the default key sort would be wasted work
+    grouped = df.groupby(group_col, observed=True, sort=False)[value_col].agg(agg).reset_index()
+    values = grouped[value_col]
+    if not pd.api.types.is_numeric_dtype(values):
+        return grouped.sort_values(by=value_col, ascending=False).head(n)
+    positions = _top_n_positions(values.to_numpy(dtype=np.float64, na_value=np.nan), n)
+    return grouped.iloc[positions]
 
 def get_simple_outliers(df: pd.DataFrame, col: str, z_thresh: float = 2.5):
     """Return rows where the specified column has z-score beyond the threshold.
@@ -31,12 +139,12 @@ def get_simple_outliers(df: pd.DataFrame, col: str, z_thresh: float = 2.5):
     Returns:
         pd.DataFrame: Subset of df containing potential outliers.
     """
-    if df is None or df.empty:
+    if not is_nonempty(df):
         return pd.DataFrame()
     if col not in df.columns:
         return pd.DataFrame()
     s = df[col]
     if not pd.api.types.is_numeric_dtype(s):
         return pd.DataFrame()
-    z = (s - s.mean()) / s.std(ddof=0)
-    return df[(z > z_thresh) | (z < -z_thresh)]
\ No newline at end of file
+    mask = _zscore_outlier_mask(s.to_numpy(dtype=np.float64, na_value=np.nan), float(z_thresh))
+    return df.iloc[mask]
\ No newline at end of file
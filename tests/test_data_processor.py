@@ -0,0 +1,28 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_processor import get_missing_report, load_data
+
+
+def _load_csv(tmp_path, text):
+    path = tmp_path / "data.csv"
+    path.write_text(text)
+    return load_data(SimpleNamespace(name=str(path)))
+
+
+def test_blank_text_cells_are_missing(tmp_path):
+    df = _load_csv(tmp_path, "id,note\n1,a\n2,\n3,NA\n4,b\n")
+    report = get_missing_report(df)
+    assert report.loc["note", "missing_count"] == 2
+
+
+def test_non_utf8_text_is_rejected(tmp_path):
+    path = tmp_path / "latin1.csv"
+    path.write_bytes("id,name\n1,café\n".encode("latin-1"))
+    with pytest.raises(ValueError, match="Error loading file"):
+        load_data(SimpleNamespace(name=str(path)))
@@ -0,0 +1,51 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visualizations import _hist_numba, plot_distribution, plot_time_series
+
+
+def test_hist_numba_skips_infinities():
+    values = np.array([-np.inf, 1.0, 2.0, 3.0, np.inf])
+    counts, edges = _hist_numba(values, 30, 2)
+    expected_counts, expected_edges = np.histogram(values[np.isfinite(values)], bins=30)
+    assert counts.sum() == 3
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_allclose(edges, expected_edges)
+
+
+def test_hist_numba_all_non_finite():
+    counts, edges = _hist_numba(np.array([np.inf, -np.inf]), 30, 2)
+    assert counts.sum() == 0
+    assert np.isfinite(edges).all()
+
+
+def test_plot_distribution_ignores_infinities():
+    df = pd.DataFrame({"v": [1.0, 2.0, np.inf, -np.inf, np.nan, 3.0]})
+    for kind in ("hist", "box"):
+        assert plot_distribution(df, "v", kind=kind) is not None
+    assert plot_distribution(pd.DataFrame({"v": [np.inf, -np.inf]}), "v") is None
+
+
+def test_plot_time_series_buckets_tz_aware_dates_by_local_day():
+    dates = pd.date_range("2020-06-01 00:30", periods=3, freq="D", tz="Europe/Berlin")
+    df = pd.DataFrame({"date": dates, "value": [1.0, 2.0, 3.0]})
+    fig = plot_time_series(df, "date", "value")
+    assert list(np.asarray(fig.data[0].x)) == list(
+        np.array(["2020-06-01", "2020-06-02", "2020-06-03"], dtype="datetime64[D]")
+    )
+
+
+def test_hist_numba_matches_numpy_on_bin_edges():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        edges = np.linspace(*np.sort(rng.normal(size=2)), 31)
+        values = edges[rng.integers(0, len(edges), 100)]
+        counts, bin_edges = _hist_numba(values, 30, 3)
+        expected_counts, expected_edges = np.histogram(values, bins=30)
+        np.testing.assert_array_equal(counts, expected_counts)
+        np.testing.assert_array_equal(bin_edges, expected_edges)
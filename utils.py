@@ -1,7 +1,107 @@
 """Generic helper utilities for the BI dashboard."""
 
+from collections import OrderedDict
+from concurrent.futures import Future
 from typing import Any
+import functools
+import threading
+import weakref
+
+import pandas as pd
+
+# Futures for results memoized per DataFrame (see cached_by_frame).
+_FRAME_CACHE: dict[tuple, Future] = {}
+# Frame ids that already have a finalizer evicting their cache entries.
+_TRACKED_FRAMES: set[int] = set()
+# Recency order of cached keys per (function, frame) for caches with a maxsize.
+_FRAME_LRU: dict[tuple[str, int], OrderedDict] = {}
+_FRAME_LOCK = threading.Lock()
+
+
+def _evict_frame(frame_id: int) -> None:
+    """Drop all cached results belonging to a garbage-collected DataFrame."""
+    with _FRAME_LOCK:
+        _TRACKED_FRAMES.discard(frame_id)
+        for key in [k for k in _FRAME_CACHE if k[1] == frame_id]:
+            _FRAME_CACHE.pop(key, None)
+        for lru_key in [k for k in _FRAME_LRU if k[1] == frame_id]:
+            del _FRAME_LRU[lru_key]
+
+
+def cached_by_frame(func=None, *, maxsize: int | None = None):
+    """
+    Memoize a function whose first argument is a DataFrame.
+
+    Use as @cached_by_frame, or as @cached_by_frame(maxsize=n) to keep at most
+    n results per frame, dropping the least recently used first. Bound caches
+    whose results are large or vary with many argument combinations, since
+    entries otherwise live as long as the frame (e.g. a Gradio session state).
+
+    Results are keyed on the frame's identity plus its shape, columns and first
+    index label, and are evicted when the frame is garbage collected. Frames held
+    in the dashboard state are never mutated in place (uploads and filters create
+    new frames), so identity is a safe key.
+
+    Each entry is a Future, so concurrent callers asking for the same result
+    (e.g. several sessions clicking Compute Statistics on one dataset) wait for
+    a single computation instead of each running their own.
+    """
+    if func is None:
+        return functools.partial(cached_by_frame, maxsize=maxsize)
+
+    @functools.wraps(func)
+    def wrapper(df, *args, **kwargs):
+        if df is None:
+            return func(df, *args, **kwargs)
+        key = (
+            func.__qualname__,
+            id(df),
+            df.shape,
+            tuple(df.columns),
+            df.index[0] if len(df) else None,
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+        with _FRAME_LOCK:
+            future = _FRAME_CACHE.get(key)
+            owner = future is None
+            if owner:
+                future = _FRAME_CACHE[key] = Future()
+                if id(df) not in _TRACKED_FRAMES:
+                    _TRACKED_FRAMES.add(id(df))
+                    weakref.finalize(df, _evict_frame, id(df))
+            if maxsize is not None:
+                recent = _FRAME_LRU.setdefault((func.__qualname__, id(df)), OrderedDict())
+                recent[key] = None
+                recent.move_to_end(key)
+                while len(recent) > maxsize:
+                    # waiters on an evicted in-flight entry still hold its Future
+                    _FRAME_CACHE.pop(recent.popitem(last=False)[0], None)
+        if owner:
+            try:
+                future.set_result(func(df, *args, **kwargs))
+            except BaseException as e:
+                # don't cache failures; waiters still get the exception
+                with _FRAME_LOCK:
+                    _FRAME_CACHE.pop(key, None)
+                    _FRAME_LRU.get((func.__qualname__, id(df)), {}).pop(key, None)
+                future.set_exception(e)
+        return future.result()
+
+    return wrapper
+
 
 def safe_str(value: Any) -> str:
     """Convert a value to string, returning an empty string for None."""
-    return "" if value is None else str(value)
\ No newline at end of file
+    return "" if value is None else str(value)
+
+def is_nonempty(df: pd.DataFrame | None) -> bool:
+    """Return True if df is a DataFrame with at least one row and column."""
+    return df is not None and not df.empty
+
+def columns_as_str(columns: pd.Index) -> list[str]:
+    """Return column labels as a list of strings, skipping the conversion when they already are."""
+    # inferred_type is cached on the Index, so the common all-string case costs no scan
+    if columns.inferred_type == "string":
+        return columns.tolist()
+    return columns.astype(str).tolist()
\ No newline at end of file
@@ -1,11 +1,261 @@
+import copy
+import functools
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from PIL import Image
-import io
-import plotly.express as px
+from numba import get_num_threads, njit, prange
+
+from data_processor import get_correlation_matrix
+from utils import cached_by_frame, is_nonempty
+
+try:
+    import polars as pl
+except ImportError:  # optional: multithreaded groupby for the bar and line charts
+    pl = None
+
+
+# Figures kept per plot function and dataset, and full-length columns kept
+# per helper and dataset (parsed dates, categorical keys, float32 values).
+_FIGURE_CACHE_SIZE = 16
+_COLUMN_CACHE_SIZE = 4
+
+
+def _cached_figure(func):
+    """Memoize a plot function per DataFrame and arguments (see cached_by_frame).
+
+    Re-triggering a plot with the same inputs returns a copy of the cached
+    figure, so callers can modify what they get without touching the cache.
+    Only the _FIGURE_CACHE_SIZE most recently used figures are kept per dataset.
+    """
+    cached = cached_by_frame(func, maxsize=_FIGURE_CACHE_SIZE)
+
+    @functools.wraps(func)
+    def wrapper(df, *args, **kwargs):
+        fig = cached(df, *args, **kwargs)
+        return None if fig is None else copy.copy(fig)
+
+    return wrapper
+
+
+@njit(cache=True, parallel=True)
+def _hist_numba(values, nbins, nchunks):
+    """Equal-width histogram of the finite values over their range, like np.histogram.
+
+    The min/max reduction and the binning each run in parallel over row chunks;
+    every chunk counts into its own row of bins, which are summed at the end.
+    Non-finite values are skipped, since they have no bin and would otherwise
+    turn the bin index into garbage (there is no bounds check in nopython mode).
+    Edges and the edge correction follow np.histogram, so values that sit on a
+    bin edge are counted in the same bin.
+    """
+    n = values.shape[0]
+    step = (n + nchunks - 1) // nchunks
+    los = np.full(nchunks, np.inf)
+    his = np.full(nchunks, -np.inf)
+    for c in prange(nchunks):
+        for i in range(c * step, min(n, (c + 1) * step)):
+            v = values[i]
+            if not np.isfinite(v):
+                continue
+            if v < los[c]:
+                los[c] = v
+            if v > his[c]:
+                his[c] = v
+    lo = los.min()
+    hi = his.max()
+    if not (np.isfinite(lo) and np.isfinite(hi)):
+        # no finite values at all: empty bins over [0, 1], as np.histogram does
+        lo = 0.0
+        hi = 1.0
+    elif lo == hi:
+        # same widening np.histogram applies to a constant column
+        lo -= 0.5
+        hi += 0.5
+    scale = nbins / (hi - lo)
+    # same arithmetic as np.linspace, so the edges match np.histogram's bit for bit
+    edges = np.arange(nbins + 1) * ((hi - lo) / nbins) + lo
+    edges[nbins] = hi
+    counts = np.zeros((nchunks, nbins), dtype=np.int64)
+    for c in prange(nchunks):
+        for i in range(c * step, min(n, (c + 1) * step)):
+            v = values[i]
+            if not np.isfinite(v):
+                continue
+            b = int((v - lo) * scale)
+            # the maximum lands in the last (closed) bin; the clamp also covers
+            # rounding at the edges when hi - lo overflows
+            if b >= nbins:
+                b = nbins - 1
+            elif b < 0:
+                b = 0
+            # the scaled index can round across an edge; check against the
+            # returned edges the way np.histogram does
+            if b > 0 and v < edges[b]:
+                b -= 1
+            elif b < nbins - 1 and v >= edges[b + 1]:
+                b += 1
+            counts[c, b] += 1
+    return counts.sum(axis=0), edges
+
+
+# Outlier markers drawn next to a precomputed box; beyond this they are thinned.
+_MAX_BOX_OUTLIERS = 2000
+# Aggregations that may run on float32 values, and the magnitude below which
+# float32 keeps enough digits for a chart.
+_FLOAT32_AGGS = ("sum", "min", "max")
+_FLOAT32_SAFE_MAX = 1e6
+# Aggregations with a direct polars equivalent (same null handling as pandas).
+_POLARS_AGGS = ("sum", "mean", "count", "min", "max")
+
+
+def _box_traces(values: np.ndarray, name: str) -> list:
+    """Build a horizontal Tukey box from precomputed statistics instead of raw points.
+
+    Whiskers end at the most extreme values within 1.5 IQR of the quartiles and
+    only the points beyond them are sent, as a marker trace, so the payload does
+    not grow with the row count.
+
+    Args:
+        values (np.ndarray): Non-missing numeric values.
+        name (str): Trace name shown on the axis.
+
+    Returns:
+        list: The box trace, followed by a scatter trace of outliers if there are any.
+    """
+    import plotly.graph_objects as go
+
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    outside = (values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)
+    inside = values[~outside]
+    traces = [
+        go.Box(
+            q1=[q1],
+            median=[median],
+            q3=[q3],
+            lowerfence=[inside.min()],
+            upperfence=[inside.max()],
+            y=[name],
+            orientation="h",
+            name=name,
+            showlegend=False,
+        )
+    ]
+    outliers = np.sort(values[outside])
+    if len(outliers):
+        if len(outliers) > _MAX_BOX_OUTLIERS:
+            # evenly spaced in sorted order, so both extremes are always kept
+            keep = np.linspace(0, len(outliers) - 1, _MAX_BOX_OUTLIERS).round().astype(np.int64)
+            outliers = outliers[keep]
+        traces.append(
+            go.Scatter(
+                x=outliers,
+                y=np.full(len(outliers), name, dtype=object),
+                mode="markers",
+                marker={"size": 4},
+                name="outliers",
+                showlegend=False,
+            )
+        )
+    return traces
+
+
+@cached_by_frame(maxsize=_COLUMN_CACHE_SIZE)
+def _parsed_dates(df: pd.DataFrame, date_col: str) -> pd.Series:
+    """Parse a column to datetimes once per dataset; unparseable values become NaT.
+
+    Re-rendering the time series with another value column or aggregation reuses
+    the parsed Series instead of running to_datetime again.
+    """
+    return pd.to_datetime(df[date_col], errors="coerce")
+
+
+@cached_by_frame(maxsize=_COLUMN_CACHE_SIZE)
+def _category_keys(df: pd.DataFrame, column: str) -> pd.Series:
+    """Return a column as a categorical, converting string/object columns once per dataset.
+
+    Grouping by the categorical hashes its integer codes rather than every
+    Python string, and the conversion is reused across re-renders.
+    """
+    series = df[column]
+    if series.dtype.kind == "O" and not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    return series
+
+
+@cached_by_frame(maxsize=_COLUMN_CACHE_SIZE)
+def _float32_values(df: pd.DataFrame, column: str) -> pd.Series:
+    """Return a float64 column as float32 when its magnitudes stay below _FLOAT32_SAFE_MAX.
+
+    Halves the memory groupby reads for plotted sums/minima/maxima; other
+    columns are returned unchanged. Cached, so the check and cast run once per dataset.
+    """
+    values = df[column]
+    if values.dtype == np.float64 and values.abs().max() < _FLOAT32_SAFE_MAX:
+        values = values.astype(np.float32)
+    return values
+
+
+def _polars_group_agg(keys, values: pd.Series, agg: str, sort: bool = False):
+    """Aggregate values by keys with polars' multithreaded group_by.
 
+    Rows with a missing key are dropped, like pandas groupby. Groups come out in
+    order of first appearance, or sorted by key if `sort` is set.
 
+    Args:
+        keys (pd.Series | np.ndarray): Group key per row.
+        values (pd.Series): Values to aggregate; NaN counts as missing.
+        agg (str): One of _POLARS_AGGS.
+        sort (bool): Sort the groups by key.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray] | None: Group keys and aggregated values, or
+        None if the columns can't be converted (e.g. mixed-type objects).
+    """
+    try:
+        frame = pl.DataFrame([pl.Series("key", keys), pl.Series("value", values)])
+    except Exception:
+        return None
+    grouped = (
+        frame.drop_nulls("key")
+        .group_by("key", maintain_order=not sort)
+        .agg(getattr(pl.col("value"), agg)())
+    )
+    if sort:
+        grouped = grouped.sort("key")
+    return grouped["key"].to_numpy(), grouped["value"].to_numpy()
+
+
+def _m4_indices(x: np.ndarray, y: np.ndarray, width: int) -> np.ndarray:
+    """Select the rows an M4 downsampling keeps for a line chart `width` pixels wide.
+
+    The x range is split into `width` equal buckets and, per bucket, the rows
+    with the first/last x and the min/max y are kept, which preserves the
+    rendered shape of the line.
+
+    Args:
+        x (np.ndarray): Ascending x positions as numbers.
+        y (np.ndarray): Values aligned with x.
+        width (int): Number of buckets (plot width in pixels).
+
+    Returns:
+        np.ndarray: Sorted positional indices of the rows to keep.
+    """
+    x = x.astype(np.float64)
+    span = x[-1] - x[0]
+    if span:
+        bucket = np.minimum(((x - x[0]) / span * width).astype(np.int64), width - 1)
+    else:
+        bucket = np.zeros(len(x), dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(x)] - 1
+    missing = np.isnan(y)
+    mins = pd.Series(np.where(missing, np.inf, y)).groupby(bucket, sort=False).idxmin().to_numpy()
+    maxs = pd.Series(np.where(missing, -np.inf, y)).groupby(bucket, sort=False).idxmax().to_numpy()
+    return np.unique(np.concatenate([starts, ends, mins, maxs]))
+
+
+@_cached_figure
 def plot_distribution(df: pd.DataFrame, column: str, kind: str = "hist"):
     """Create a distribution plot (histogram or boxplot) for a numeric column.
 
@@ -17,28 +267,76 @@ def plot_distribution(df: pd.DataFrame, column: str, kind: str = "hist"):
     Returns:
         plotly.graph_objs._figure.Figure | None
     """
-    if df is None or len(df) == 0:
+    # plotly is imported on first plot rather than when the module loads
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    if not is_nonempty(df):
         return None
     if column not in df.columns:
         return None
 
     series = df[column]
-    if not pd.api.types.is_numeric_dtype(series):
+    # a dtype.kind lookup instead of is_numeric_dtype's dispatch chain
+    if series.dtype.kind not in "biuf":
+        return None
+
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    # drop NaN and ±inf; neither has a place on a histogram or box axis
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
         return None
 
     if kind == "box":
-        fig = px.box(df, x=column, title=f"Box Plot of {column}")
-    else:
-        fig = px.histogram(
-            df,
-            x=column,
-            nbins=30,
-            marginal="box",
-            title=f"Distribution of {column}",
-        )
+        fig = go.Figure(_box_traces(values, column))
+        fig.update_xaxes(title_text=column)
+        fig.update_yaxes(showticklabels=False)
+        fig.update_layout(title=f"Box Plot of {column}")
+        return fig
+
+    # bin on the server so the figure carries ~30 bars instead of every row
+    counts, edges = _hist_numba(values, 30, min(get_num_threads(), len(values)))
 
+    fig = make_subplots(
+        rows=2, cols=1, shared_xaxes=True, row_heights=[0.2, 0.8], vertical_spacing=0.02
+    )
+    for trace in _box_traces(values, column):
+        fig.add_trace(trace, row=1, col=1)
+    fig.add_trace(
+        go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            name=column,
+            showlegend=False,
+        ),
+        row=2,
+        col=1,
+    )
+    fig.update_yaxes(showticklabels=False, row=1, col=1)
+    fig.update_xaxes(title_text=column, row=2, col=1)
+    fig.update_yaxes(title_text="count", row=2, col=1)
+    fig.update_layout(title=f"Distribution of {column}", bargap=0)
     return fig
 
+def _pandas_bar_agg(keys: pd.Series, values: pd.Series, agg):
+    """Group values by keys with pandas for plot_category_bar; returns (keys, values) arrays."""
+    # observed/sort=False: skip empty categories and the key sort pandas does by default
+    groups = values.groupby(keys, observed=True, sort=False)
+    if callable(agg):
+        try:
+            grouped = groups.agg(
+                agg, engine="numba", engine_kwargs={"nopython": True, "parallel": True}
+            )
+        except Exception:
+            # not numba-compilable (or non-numeric values): fall back to the Python path
+            grouped = groups.agg(agg)
+    else:
+        grouped = groups.agg(agg)
+    return grouped.index.to_numpy(), grouped.to_numpy()
+
+
+@_cached_figure
 def plot_category_bar(
     df: pd.DataFrame,
     category_col: str,
@@ -51,20 +349,43 @@ def plot_category_bar(
         df (pd.DataFrame): Input DataFrame.
         category_col (str): Categorical column for the x-axis.
         value_col (str): Numeric column to aggregate on the y-axis.
-        agg (str): Aggregation function (e.g., 'sum', 'mean', 'count').
+        agg (str | callable): Aggregation function (e.g., 'sum', 'mean', 'count'),
+            or a numba-compilable callable taking (values, index).
 
     Returns:
         plotly.graph_objs._figure.Figure or None: Plotly Figure or None if invalid
     """
-    if df is None or len(df) == 0:
+    import plotly.graph_objects as go
+
+    if not is_nonempty(df):
         return None
     if category_col not in df.columns or value_col not in df.columns:
         return None
 
-    grouped = df.groupby(category_col)[value_col].agg(agg).reset_index()
-    fig = px.bar(grouped, x=category_col, y=value_col, title=f"{agg} of {value_col} by {category_col}")
+    values = _float32_values(df, value_col) if agg in _FLOAT32_AGGS else df[value_col]
+    keys = _category_keys(df, category_col)
+    result = None
+    if pl is not None and agg in _POLARS_AGGS:
+        result = _polars_group_agg(keys, values, agg)
+    if result is not None:
+        x, y = result
+    else:
+        x, y = _pandas_bar_agg(keys, values, agg)
+    if callable(agg):
+        agg = getattr(agg, "__name__", "custom")
+    # plot straight from the aggregated arrays; no intermediate frame
+    fig = go.Figure(go.Bar(x=x, y=y))
+    fig.update_layout(
+        title=f"{agg} of {value_col} by {category_col}",
+        xaxis_title=category_col,
+        yaxis_title=value_col,
+    )
+    # groups come back in first-appearance order; a categorical axis draws them
+    # in trace order, so sort on the client to keep the sorted bars
+    fig.update_xaxes(categoryorder="category ascending")
     return fig
 
+@_cached_figure
 def plot_correlation_heatmap(df: pd.DataFrame):
     """
     Create a correlation heatmap for numeric columns using Plotly.
@@ -75,60 +396,95 @@ def plot_correlation_heatmap(df: pd.DataFrame):
     Returns:
         plotly.graph_objs._figure.Figure | None: Plotly heatmap, or None if fewer than two numeric columns are available.
     """
-    if df is None or len(df) == 0:
+    import plotly.express as px
+
+    if not is_nonempty(df):
         return None
 
-    numeric_df = df.select_dtypes(include="number")
-    if numeric_df.shape[1] < 2:
+    # labels show two decimals, so single precision (sgemm) is enough here
+    corr = get_correlation_matrix(df, dtype=np.float32)
+    if corr.shape[1] < 2:
         return None
 
-    corr = numeric_df.corr()
+    values = corr.to_numpy()
+    # format the cell labels once here instead of per cell in the browser
+    text = np.where(np.isnan(values), "", np.char.mod("%.2f", values))
     fig = px.imshow(
         corr,
-        text_auto=".2f",
         color_continuous_scale="RdBu",
         origin="lower",
         title="Correlation Heatmap (numeric features)",
     )
+    fig.update_traces(text=text, texttemplate="%{text}")
     return fig
 
+@_cached_figure
 def plot_time_series(
     df: pd.DataFrame,
     date_col: str,
     value_col: str,
     agg: str = "sum",
+    target_width: int = 800,
 ):
     """Create a time series plot for an aggregated numeric metric over time.
+
+    Series with more than 4 points per pixel of `target_width` are M4-downsampled,
+    so the figure size is bounded by the plot resolution rather than the date range.
     
     Args:
         df (pd.DataFrame): Input DataFrame.
         date_col (str): Column containing date or datetime information.
         value_col (str): Numeric column to aggregate.
         agg (str): Aggregation function (e.g., 'sum', 'mean', 'count').
+        target_width (int): Approximate plot width in pixels.
 
     Returns:
         plotly.graph_objs._figure.Figure | None: Plotly line chart, or None if the date column cannot be parsed or no data remains.
     """
-    if df is None or len(df) == 0:
+    import plotly.graph_objects as go
+
+    if not is_nonempty(df):
         return None
     if date_col not in df.columns or value_col not in df.columns:
         return None
 
-    ts_df = df.copy()
-    ts_df[date_col] = pd.to_datetime(ts_df[date_col], errors="coerce")
-    ts_df = ts_df.dropna(subset=[date_col])
-
-    grouped = (
-        ts_df
-        .groupby(ts_df[date_col].dt.date)[value_col]
-        .agg(agg)
-        .reset_index()
-        .rename(columns={date_col: "date"})
-    )
+    # only the two columns involved are touched; the frame itself is never copied
+    dates = _parsed_dates(df, date_col)
+    if dates.dt.tz is not None:
+        # bucket on wall-clock dates like .dt.date did; a tz-aware to_numpy()
+        # would give Timestamp objects and the cast below would shift to UTC
+        dates = dates.dt.tz_localize(None)
+    mask = dates.notna().to_numpy()
 
-    if grouped.empty:
+    # bucket by calendar day with a vectorized cast so groupby hashes int64 days
+    # instead of one datetime.date object per row
+    day_bucket = dates.to_numpy()[mask].astype("datetime64[D]")
+    values = _float32_values(df, value_col) if agg in _FLOAT32_AGGS else df[value_col]
+    result = None
+    if pl is not None and agg in _POLARS_AGGS:
+        # line traces connect points in row order, so polars returns them sorted
+        result = _polars_group_agg(day_bucket, values[mask], agg, sort=True)
+    if result is not None:
+        x, y = result
+    else:
+        grouped = values[mask].groupby(day_bucket, sort=False).agg(agg)
+        # only unsorted input (where first-appearance order isn't chronological)
+        # pays for a sort
+        if not grouped.index.is_monotonic_increasing:
+            grouped = grouped.sort_index()
+        x = grouped.index.to_numpy(dtype="datetime64[D]")
+        y = grouped.to_numpy()
+    if len(x) == 0:
         return None
 
-    fig = px.line(grouped, x="date", y=value_col,
-                  title=f"{agg} of {value_col} over time")
+    if len(x) > 4 * target_width:
+        keep = _m4_indices(
+            x.astype(np.int64), pd.Series(y).to_numpy(dtype=np.float64, na_value=np.nan), target_width
+        )
+        x, y = x[keep], y[keep]
+
+    fig = go.Figure(go.Scatter(x=x, y=y, mode="lines"))
+    fig.update_layout(
+        title=f"{agg} of {value_col} over time", xaxis_title="date", yaxis_title=value_col
+    )
     return fig
\ No newline at end of file